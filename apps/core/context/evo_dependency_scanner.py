@@ -9,7 +9,7 @@ implementation that:
 
 * walks the repository and optional extra roots while skipping noisy folders;
 * builds a forward/backward map of Python imports using static inspection;
-* detects log/cache like artefacts for timeline analysis; and
+* detects log/cache like artefacts and correlates them into timeline waves; and
 * copies large ``.txt`` corpora into the ``data/evo_ingest`` staging area while
   emitting an annotated companion file.
 
@@ -20,44 +20,115 @@ uses best-effort parsing so that decoding errors do not halt the scan.
 from __future__ import annotations
 
 import argparse
+import ast
+import hashlib
+import heapq
 import json
+import mmap
 import os
 import re
 import sys
+import time
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from shutil import copy2
-from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from shutil import copyfileobj
+from typing import (
+    Any,
+    BinaryIO,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-PY_EXT = (".py",)
-LOGLIKE_EXT = (".log", ".cache", ".tmp", ".db", ".sqlite", ".jsonl")
-PRIORITY_TXT_EXT = (".txt",)
+try:  # Optional dependency
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is optional
+    orjson = None  # type: ignore
+
+try:  # Optional dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore
+
+try:  # Optional dependency
+    import re2  # type: ignore
+except Exception:  # pragma: no cover - re2 is optional
+    re2 = None  # type: ignore
+
+KIND_CODE = "code"
+KIND_LOG = "log"
+KIND_TXT = "txt"
+
+# Lower-cased file extension (without the dot) -> scan bucket.  A dict lookup
+# on the ``str.rpartition`` tail is about twice as fast as a combined
+# ``\.(py|log|...)\Z`` regex search per name, so classification avoids ``re``.
+SUFFIX_KIND: Dict[str, str] = {
+    "py": KIND_CODE,
+    "log": KIND_LOG,
+    "cache": KIND_LOG,
+    "tmp": KIND_LOG,
+    "db": KIND_LOG,
+    "sqlite": KIND_LOG,
+    "jsonl": KIND_LOG,
+    "txt": KIND_TXT,
+}
 PRIORITY_THRESHOLD_KB = 10
+COPY_CHUNK_BYTES = 1 << 20
+REPORT_BUFFER_BYTES = 1 << 20
+MMAP_THRESHOLD_BYTES = 256 * 1024
+MIN_IMPORT_BYTES = len(b"import x")
+ARTIFACT_WINDOW_SEC = 30
+LOGLIKE_REPORT_LIMIT = 200
+ARTIFACTS_NDJSON_NAME = "evo_artifacts.ndjson"
+IMPORT_CACHE_NAME = ".evo_dep_cache.json"
+MAGNET_LIMIT = 20
+IMPORT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Directory listings are latency-bound; a few concurrent scandir calls are
+# enough to keep slow storage busy.
+SCANDIR_WORKERS = 4
+PRIORITY_COPY_WORKERS = 8
+# Priority texts up to this size are read once for both copies; with
+# PRIORITY_COPY_WORKERS in flight this bounds the buffers to ~64 MiB.
+FUSED_COPY_MAX_BYTES = 8 << 20
+
+# Hidden directories (``.git``, ``.venv``, ``.mypy_cache`` ...) are always
+# pruned by their leading dot; SKIP_DIRS only lists the remaining noisy names.
+SKIP_DIRS: FrozenSet[str] = frozenset(
+    {
+        "__pycache__",
+        "build",
+        "dist",
+        "node_modules",
+        "venv",
+    }
+)
 
-SKIP_DIRS: Set[str] = {
-    ".git",
-    ".idea",
-    ".mypy_cache",
-    ".pytest_cache",
-    ".venv",
-    ".vscode",
-    "__pycache__",
-    "build",
-    "dist",
-    "logs/evo_ingest",
-    "node_modules",
-    "venv",
-}
+PathInput = Union[str, "os.PathLike[str]"]
 
 INGEST_ROOT_REL = Path("data") / "evo_ingest"
 PENDING_RAW_REL = INGEST_ROOT_REL / "pending" / "raw"
 PENDING_ANNOT_REL = INGEST_ROOT_REL / "pending" / "annotated"
 PROCESSED_REL = INGEST_ROOT_REL / "processed"
-
-IMPORT_PATTERN = re.compile(
-    r"^\s*(?:from\s+([a-zA-Z_][\w\.]*)\s+import|import\s+([a-zA-Z_][\w\.]*))",
-    re.MULTILINE,
+# Corpora from outside the repository are staged under
+# ``pending/{raw,annotated}/external/<source dir digest>/``.
+EXTERNAL_STAGE_DIR = "external"
+
+# Bytes pattern: import statements are ASCII, so files are scanned without
+# decoding them and only the captured module names are turned into ``str``.
+# Only the top-level package is captured (``os`` for ``os.path``), so no
+# ``split`` is needed per match.
+IMPORT_PATTERN_SOURCE = (
+    rb"^\s*(?:from\s+([a-zA-Z_]\w*)[\w\.]*\s+import|import\s+([a-zA-Z_]\w*))"
 )
 
 ANNOTATION_TEMPLATE = (
@@ -71,12 +142,14 @@ ANNOTATION_TEMPLATE = (
 # Path helpers and environment detection
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=1)
 def detect_env_root() -> Path:
     """Best-effort detection of the repository root.
 
     The function climbs up from the current module until a ``.git`` directory is
     encountered.  If no repository root can be located we fall back to the
-    current working directory to avoid raising during scans.
+    current working directory to avoid raising during scans.  The result is
+    memoised because the repository root cannot move during a process run.
     """
 
     here = Path(__file__).resolve()
@@ -86,9 +159,28 @@ def detect_env_root() -> Path:
     return Path.cwd()
 
 
+@lru_cache(maxsize=1)
+def detect_shared_storage() -> Optional[Path]:
+    """Return the Termux / Android shared storage root when one is mounted."""
+
+    for candidate in (Path.home() / "storage", Path("/sdcard")):
+        if candidate.exists():
+            return candidate
+    return None
+
+
 def ensure_ingest_dirs(repo_root: Path) -> Dict[str, Path]:
-    """Create ingest directories relative to ``repo_root`` and return them."""
+    """Create ingest directories relative to ``repo_root`` and return them.
+
+    The ``mkdir`` chain runs once per repo root and process; every call gets
+    a fresh dict.
+    """
+
+    return dict(_ensure_ingest_dirs(Path(repo_root)))
 
+
+@lru_cache(maxsize=8)
+def _ensure_ingest_dirs(repo_root: Path) -> Tuple[Tuple[str, Path], ...]:
     ingest_root = repo_root / INGEST_ROOT_REL
     raw_dir = repo_root / PENDING_RAW_REL
     annot_dir = repo_root / PENDING_ANNOT_REL
@@ -97,557 +189,938 @@ def ensure_ingest_dirs(repo_root: Path) -> Dict[str, Path]:
     for path in (ingest_root, raw_dir, annot_dir, processed_dir):
         path.mkdir(parents=True, exist_ok=True)
 
-    return {
-        "ingest_root": ingest_root,
-        "raw": raw_dir,
-        "annotated": annot_dir,
-        "processed": processed_dir,
-    }
+    return (
+        ("ingest_root", ingest_root),
+        ("raw", raw_dir),
+        ("annotated", annot_dir),
+        ("processed", processed_dir),
+    )
 
 
-def is_relative_to(path: Path, ancestor: Path) -> bool:
-    """Return ``True`` if *path* is located inside *ancestor*."""
+# Candidate roots overlap heavily between calls (repo root, shared storage,
+# CLI extras), so their symlink chains are only walked once per process.
+_realpath_cached = lru_cache(maxsize=64)(os.path.realpath)
 
-    try:
-        path.resolve().relative_to(ancestor.resolve())
-        return True
-    except ValueError:
-        return False
+
+def dir_prefix(path: PathInput) -> str:
+    """Return the canonical form of directory *path* with a trailing separator.
+
+    Scanned entries come from ``os.scandir`` under canonical roots, so
+    containment is then a ``str.startswith`` test instead of resolving every
+    file path.
+    """
+
+    return os.path.join(_realpath_cached(os.fspath(path)), "")
 
 
 def list_roots(extra: Optional[Sequence[str]] = None) -> List[Path]:
-    """Return the list of root directories that should be scanned."""
+    """Return the list of root directories that should be scanned.
+
+    Results are memoised per distinct *extra* tuple for the lifetime of the
+    process; call :func:`reset_root_caches` after mounting new storage in a
+    long-running process.
+    """
+
+    return list(_list_roots(tuple(extra or ())))
+
 
+@lru_cache(maxsize=None)
+def _list_roots(extra: Tuple[str, ...]) -> Tuple[Path, ...]:
     repo_root = detect_env_root()
     roots: List[Path] = [repo_root]
 
-    # Termux / Android shared storage hints
-    for candidate in (Path.home() / "storage", Path("/sdcard")):
+    shared_storage = detect_shared_storage()
+    if shared_storage is not None:
+        roots.append(shared_storage)
+
+    for raw in extra:
+        candidate = Path(raw).expanduser()
         if candidate.exists():
             roots.append(candidate)
-            break
-
-    if extra:
-        for raw in extra:
-            candidate = Path(raw).expanduser()
-            if candidate.exists():
-                roots.append(candidate)
 
     # Deduplicate while preserving order
-    seen: Set[Path] = set()
+    seen: Set[str] = set()
     unique: List[Path] = []
     for root in roots:
-        resolved = root.resolve()
+        resolved = _realpath_cached(str(root))
         if resolved not in seen:
             seen.add(resolved)
-            unique.append(resolved)
+            unique.append(Path(resolved))
+
+    return tuple(unique)
+
+
+def reset_root_caches() -> None:
+    """Forget every memoised root lookup (repo, shared storage, scan roots,
+    ingest directories)."""
+
+    detect_env_root.cache_clear()
+    detect_shared_storage.cache_clear()
+    _realpath_cached.cache_clear()
+    _list_roots.cache_clear()
+    _ensure_ingest_dirs.cache_clear()
 
-    return unique
 
+DirKey = Tuple[int, Union[int, str]]
+
+
+def _dir_key(path: str, stat: os.stat_result) -> DirKey:
+    """Return the ``(st_dev, st_ino)`` identity of directory *path*.
+
+    ``DirEntry.stat()`` on Windows leaves ``st_dev``/``st_ino`` at zero, so a
+    zero inode is re-read with ``os.stat``.  File systems without inode
+    numbers at all fall back to the canonical path.
+    """
+
+    if not stat.st_ino:
+        try:
+            stat = os.stat(path, follow_symlinks=False)
+        except OSError:
+            pass
+        if not stat.st_ino:
+            return (stat.st_dev, os.path.normcase(os.path.realpath(path)))
+    return (stat.st_dev, stat.st_ino)
 
-def iter_files(roots: Sequence[Path]) -> Iterator[Path]:
-    """Yield files contained within *roots* while respecting ``SKIP_DIRS``."""
 
+def _list_dir(path: str) -> Tuple[List[os.DirEntry], List[Tuple[DirKey, str]]]:
+    """List *path* once, returning its files and its walkable subdirectories.
+
+    Subdirectories come back with their :func:`_dir_key` so the caller can
+    deduplicate them; hidden, ``SKIP_DIRS`` and symlinked
+    directories are dropped here, before anything opens them.
+    """
+
+    files: List[os.DirEntry] = []
+    subdirs: List[Tuple[DirKey, str]] = []
+    try:
+        listing = os.scandir(path)
+    except OSError:
+        return files, subdirs
+    skip_dir = SKIP_DIRS.__contains__
+    with listing:
+        for entry in listing:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    name = entry.name
+                    if name[:1] == "." or skip_dir(name):
+                        continue
+                    path = entry.path
+                    subdirs.append((_dir_key(path, entry.stat(follow_symlinks=False)), path))
+                elif entry.is_file():
+                    files.append(entry)
+            except OSError:
+                continue
+    return files, subdirs
+
+
+def iter_files(
+    roots: Sequence[Path],
+    skip_roots: Sequence[PathInput] = (),
+    workers: int = 1,
+) -> Iterator[os.DirEntry]:
+    """Yield ``os.DirEntry`` objects for files within *roots*.
+
+    Directories are listed with ``os.scandir`` so the entry type comes from
+    the directory listing itself and ``DirEntry.stat()`` results are cached
+    for downstream size/mtime checks.  Hidden directories, ``SKIP_DIRS`` and
+    symlinked directories are pruned before they are opened; unreadable
+    directories are skipped silently.  Every directory is listed at most once
+    (keyed by :func:`_dir_key`), so a root nested inside another root is
+    not walked twice.  Directories in *skip_roots* (the ingest staging area)
+    are marked visited up front and therefore never descended into.
+
+    With ``workers > 1`` directory listings run concurrently on a thread
+    pool, which overlaps the ``scandir`` latency of slow storage (Termux
+    ``/sdcard``); files are then yielded in completion order rather than
+    depth-first.
+    """
+
+    visited: Set[DirKey] = set()
+    for skipped in skip_roots:
+        try:
+            stat = os.stat(skipped)
+        except OSError:
+            continue
+        visited.add(_dir_key(os.fspath(skipped), stat))
+
+    pending: List[str] = []
     for root in roots:
-        if not root.exists():
+        try:
+            stat = os.stat(root)
+        except OSError:
             continue
-        for dirpath, dirnames, filenames in os.walk(root):
-            # Mutate ``dirnames`` in-place to prune skipped directories
-            dirnames[:] = [
-                name
-                for name in dirnames
-                if name not in SKIP_DIRS and not (Path(dirpath) / name).is_symlink()
-            ]
-            for filename in filenames:
-                yield Path(dirpath) / filename
+        visited_key = _dir_key(os.fspath(root), stat)
+        if visited_key not in visited:
+            visited.add(visited_key)
+            pending.append(os.fspath(root))
+
+    if workers <= 1:
+        pending.reverse()
+        while pending:
+            files, subdirs = _list_dir(pending.pop())
+            for visited_key, subdir in subdirs:
+                if visited_key not in visited:
+                    visited.add(visited_key)
+                    pending.append(subdir)
+            yield from files
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {executor.submit(_list_dir, path) for path in pending}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                # Queue the subdirectories before yielding so the pool keeps
+                # listing while the consumer handles these files.
+                for visited_key, subdir in subdirs:
+                    if visited_key not in visited:
+                        visited.add(visited_key)
+                        running.add(executor.submit(_list_dir, subdir))
+                yield from files
 
 
 # ---------------------------------------------------------------------------
 # Scanning utilities
 # ---------------------------------------------------------------------------
 
-def read_text_safely(path: Path) -> str:
-    """Return the UTF-8 text contents of *path* or an empty string on failure."""
+def file_suffix(name: str) -> str:
+    """Return the lower-cased extension of *name* without the leading dot."""
 
-    try:
-        return path.read_text(encoding="utf-8")
-    except (OSError, UnicodeDecodeError):
-        return ""
+    _, dot, ext = name.rpartition(".")
+    return ext.lower() if dot else ""
 
 
-def parse_imports(path: Path) -> Set[str]:
-    """Extract imported modules from *path* using ``IMPORT_PATTERN``."""
+def classify_name(name: str) -> Optional[str]:
+    """Return the ``SUFFIX_KIND`` bucket for a file *name*, if any."""
 
-    text = read_text_safely(path)
-    if not text:
-        return set()
+    return SUFFIX_KIND.get(file_suffix(name))
+
+
+def classify_files(
+    roots: Sequence[Path],
+    skip_roots: Sequence[PathInput] = (),
+    workers: int = 1,
+) -> Dict[str, List[os.DirEntry]]:
+    """Walk *roots* once and bucket the files by their ``SUFFIX_KIND``.
 
-    imports: Set[str] = set()
-    for match in IMPORT_PATTERN.finditer(text):
-        module = match.group(1) or match.group(2)
-        if not module:
+    Every consumer (import scan, artefact detection, priority ingest) reads its
+    own bucket, so the tree is traversed a single time and files of no
+    interest are dropped during the walk instead of being kept in memory.
+    *skip_roots* and *workers* are forwarded to :func:`iter_files`.  A
+    pooled walk yields files in completion order, so with ``workers > 1``
+    each bucket is sorted by path to keep the scan output reproducible.
+    """
+
+    buckets: Dict[str, List[os.DirEntry]] = {KIND_CODE: [], KIND_LOG: [], KIND_TXT: []}
+    kind_of = SUFFIX_KIND.get
+    for entry in iter_files(roots, skip_roots, workers):
+        # Inlined ``classify_name``: this runs once per file in the tree.
+        _, dot, ext = entry.name.rpartition(".")
+        if not dot:
             continue
-        imports.add(module.split(".")[0])
-    return imports
+        kind = kind_of(ext) or kind_of(ext.lower())
+        if kind is not None:
+            buckets[kind].append(entry)
+    if workers > 1:
+        for entries in buckets.values():
+            entries.sort(key=lambda entry: entry.path)
+    return buckets
+
+
+@lru_cache(maxsize=1)
+def _import_pattern() -> Any:
+    """Compile ``IMPORT_PATTERN_SOURCE`` on first use rather than at import.
+
+    The linear-time ``re2`` engine is preferred when installed.  The pattern
+    is purely regular and carries its multiline flag inline, so both engines
+    accept it unchanged.
+    """
 
+    engine = re2 if re2 is not None else re
+    return engine.compile(b"(?m)" + IMPORT_PATTERN_SOURCE)
 
-def build_import_maps(py_files: Sequence[Path]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
-    """Return forward and reverse import maps for ``py_files``."""
 
-    forward: Dict[str, List[str]] = {}
-    reverse: Dict[str, Set[str]] = defaultdict(set)
+def parse_imports(path: PathInput, precise: bool = False) -> Set[str]:
+    """Extract imported modules from *path* using ``IMPORT_PATTERN_SOURCE``.
 
-    for file_path in py_files:
-        imports = sorted(parse_imports(file_path))
-        key = str(file_path)
-        forward[key] = imports
-        for module in imports:
-            reverse[module].add(key)
+    The raw bytes are scanned directly.  Files shorter than
+    ``MIN_IMPORT_BYTES`` (empty ``__init__.py`` stubs) are never read, and
+    when *path* is a ``DirEntry`` its cached stat decides that without
+    opening the file.  Files of ``MMAP_THRESHOLD_BYTES`` or more (generated
+    stubs, vendored blobs) are memory-mapped so the regex pages through them
+    on demand instead of copying them into a bytes object.  Unreadable files
+    yield an empty set.  *precise* is forwarded to :func:`_scan_imports`.
+    """
 
-    reverse_serialisable = {module: sorted(paths) for module, paths in reverse.items()}
-    return forward, reverse_serialisable
+    try:
+        if isinstance(path, os.DirEntry) and path.stat().st_size < MIN_IMPORT_BYTES:
+            return set()
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return set()
+    try:
+        size = os.fstat(fd).st_size
+        if size < MIN_IMPORT_BYTES:
+            return set()
+        if size >= MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as view:
+                return _scan_imports(view, precise)
+        data = os.read(fd, size)
+    except (OSError, ValueError):
+        return set()
+    finally:
+        os.close(fd)
+    return _scan_imports(data, precise)
 
 
-def detect_loglike(files: Sequence[Path]) -> List[Dict[str, object]]:
-    """Collect metadata about files that look like log artefacts."""
+def _scan_imports(data: Union[bytes, mmap.mmap], precise: bool = False) -> Set[str]:
+    # Reject buffers without the ``import`` keyword (``from x import y``
+    # included) before running the regex.  ``find`` rather than ``in``:
+    # ``mmap.__contains__`` does not perform a substring search.
+    if data.find(b"import") < 0:
+        return set()
 
-    entries: List[Dict[str, object]] = []
-    for path in files:
-        if path.suffix.lower() not in LOGLIKE_EXT:
-            continue
-        try:
-            stat = path.stat()
-        except OSError:
-            continue
-        entries.append(
-            {
-                "path": str(path),
-                "size_bytes": stat.st_size,
-                "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            }
-        )
-    return sorted(entries, key=lambda item: item["modified_at"], reverse=True)
+    if precise:
+        modules = _ast_imports(data[:])
+        if modules is not None:
+            return modules
+
+    # Dedupe the raw top-level names first so each distinct module is decoded
+    # once, however often the file repeats the import (e.g. inside functions).
+    # ``finditer`` rather than ``findall``: re2's ``findall`` rebuilds the
+    # result via ``type(text)()``, which fails on an ``mmap``.  Exactly one of
+    # the two groups matches.
+    heads = {match.group(1) or match.group(2) for match in _import_pattern().finditer(data)}
+    # Interned: the same few names (``os``, ``sys`` ...) recur in thousands of
+    # files and are shared between the forward lists and the reverse keys.
+    return {sys.intern(head.decode("ascii")) for head in heads}
+
+
+def _ast_imports(data: bytes) -> Optional[Set[str]]:
+    """Return the top-level modules imported by *data* according to ``ast``.
+
+    Unlike the regex this sees every name of ``import a, b`` and ignores
+    import-like lines inside strings.  Relative imports are skipped, as in
+    the regex.  Returns ``None`` when *data* does not parse (Python 2 files,
+    templates) or is too deeply nested for the parser (generated expression
+    chains), so the caller can fall back to the regex.
+    """
+
+    try:
+        tree = ast.parse(data)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None
+    modules: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                modules.add(sys.intern(alias.name.split(".", 1)[0]))
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(sys.intern(node.module.split(".", 1)[0]))
+    return modules
 
 
-def collect_priority_texts(
-    repo_root: Path,
-    files: Sequence[Path],
-    ingest_paths: Dict[str, Path],
-) -> List[Dict[str, object]]:
-    """Copy large text files into the ingest pipeline and annotate them."""
+ImportCache = Dict[str, List[Any]]
 
-    results: List[Dict[str, object]] = []
-    for path in files:
-        if path.suffix.lower() not in PRIORITY_TXT_EXT:
-            continue
-        try:
-            stat = path.stat()
-        except OSError:
-            continue
-        size_kb = stat.st_size / 1024.0
-        if size_kb < PRIORITY_THRESHOLD_KB:
-            continue
 
-        timestamp = datetime.fromtimestamp(stat.st_mtime).isoformat()
-        relative: Optional[Path] = None
-        if is_relative_to(path, repo_root):
-            relative = path.resolve().relative_to(repo_root.resolve())
+def _import_cache_tag(precise: bool = False) -> str:
+    # Records are only valid for the pattern (and parser) that produced them.
+    source = IMPORT_PATTERN_SOURCE + (b"\0ast" if precise else b"")
+    return hashlib.sha1(source).hexdigest()[:16]
 
-        target_relative = relative if relative is not None else Path(path.name)
-        raw_target = ingest_paths["raw"] / target_relative
-        annot_target = ingest_paths["annotated"] / target_relative.with_suffix(".annotated.txt")
-        raw_target.parent.mkdir(parents=True, exist_ok=True)
-        annot_target.parent.mkdir(parents=True, exist_ok=True)
 
+def load_import_cache(path: Path, precise: bool = False) -> ImportCache:
+    """Load the ``[mtime_ns, size, modules]`` records saved by an earlier run.
+
+    A missing or unreadable cache, or one written for a different
+    ``IMPORT_PATTERN_SOURCE`` or *precise* mode, simply yields an empty dict.
+    """
+
+    try:
+        raw = path.read_bytes()
+        stored = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(stored, dict) or stored.get("pattern") != _import_cache_tag(precise):
+        return {}
+    files = stored.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_import_cache(path: Path, cache: ImportCache, precise: bool = False) -> None:
+    """Persist *cache* as compact JSON next to the other scan outputs."""
+
+    tag = _import_cache_tag(precise)
+    path.write_bytes(dump_json_line({"pattern": tag, "files": cache}))
+
+
+def build_import_maps(
+    py_files: Sequence[PathInput],
+    max_workers: int = IMPORT_SCAN_WORKERS,
+    cache: Optional[ImportCache] = None,
+    base: Optional[PathInput] = None,
+    precise: bool = False,
+) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Return forward and reverse import maps for ``py_files``.
+
+    Files are read and scanned on a thread pool: the reads block outside the
+    GIL and every file is independent, so slow storage is overlapped.  The
+    results are merged on the calling thread in input order, so no locking is
+    needed.
+
+    Files below *base* are keyed by their path relative to it, which keeps
+    the map compact and portable; anything else keeps its full path.
+
+    *cache* maps those keys to ``[mtime_ns, size, modules]``.  Files whose
+    stat still matches their record are not read at all; the dict is updated
+    in place with fresh records, and entries for files that were not scanned
+    are dropped.
+
+    With *precise* every file that mentions ``import`` is parsed with
+    ``ast`` (regex fallback on syntax errors); this is markedly slower and
+    therefore opt-in.
+    """
+
+    forward: Dict[str, List[str]] = {}
+    reverse: DefaultDict[str, List[str]] = defaultdict(list)
+
+    keys = [os.fspath(file_path) for file_path in py_files]
+    if base is not None:
+        prefix = dir_prefix(base)
+        cut = len(prefix)
+        keys = [key[cut:] if key.startswith(prefix) else key for key in keys]
+
+    def scan(file_path: PathInput, key: str) -> Tuple[Set[str], Optional[List[int]]]:
+        if cache is None:
+            return parse_imports(file_path, precise), None
         try:
-            copy2(path, raw_target)
+            if isinstance(file_path, os.DirEntry):
+                stat = file_path.stat()
+            else:
+                stat = os.stat(file_path)
         except OSError:
-            continue
+            return set(), None
+        signature = [stat.st_mtime_ns, stat.st_size]
+        record = cache.get(key)
+        if isinstance(record, list) and len(record) == 3 and record[:2] == signature:
+            modules = record[2]
+            # A hand-edited or foreign cache is a miss, never a crash.
+            if isinstance(modules, list) and all(isinstance(name, str) for name in modules):
+                return set(map(sys.intern, modules)), signature
+        return parse_imports(file_path, precise), signature
+
+    def merge(parsed: Iterator[Tuple[Set[str], Optional[List[int]]]]) -> None:
+        for key, (modules, signature) in zip(keys, parsed):
+            if key in forward:
+                # Each file contributes once, so reverse lists stay unique
+                # without per-edge set inserts.
+                continue
+            imports = sorted(modules)
+            forward[key] = imports
+            for module in imports:
+                reverse[module].append(key)
+            if signature is not None:
+                cache[key] = [*signature, imports]
+
+    if max_workers > 1 and len(py_files) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            merge(executor.map(scan, py_files, keys))
+    else:
+        merge(map(scan, py_files, keys))
+
+    if cache is not None:
+        for stale in cache.keys() - forward.keys():
+            del cache[stale]
+    for paths in reverse.values():
+        paths.sort()
+    reverse.default_factory = None
+    return forward, reverse
+
+
+def rank_magnets(
+    forward: Dict[str, List[str]],
+    reverse: Dict[str, List[str]],
+    limit: int = MAGNET_LIMIT,
+) -> Dict[str, List[Tuple[str, int]]]:
+    """Return the files and modules with the most outgoing / incoming imports."""
+
+    # ``nlargest`` keeps only *limit* candidates (O(n log limit)) and matches
+    # ``sorted(..., reverse=True)[:limit]`` including the order of ties.
+    top_outgoing = heapq.nlargest(
+        limit,
+        ((name, len(modules)) for name, modules in forward.items()),
+        key=lambda item: item[1],
+    )
+    top_incoming = heapq.nlargest(
+        limit,
+        ((name, len(paths)) for name, paths in reverse.items()),
+        key=lambda item: item[1],
+    )
+    return {"top_outgoing": top_outgoing, "top_incoming": top_incoming}
+
+
+def iter_loglike(files: Sequence[os.DirEntry]) -> Iterator[Dict[str, object]]:
+    """Yield metadata for the ``KIND_LOG`` bucket from :func:`classify_files`."""
 
-        header = ANNOTATION_TEMPLATE.format(timestamp=timestamp, source=path)
+    for entry in files:
         try:
-            payload = path.read_text(encoding="utf-8", errors="replace")
-            annot_target.write_text(header + payload, encoding="utf-8")
+            stat = entry.stat()
         except OSError:
             continue
+        yield {
+            "path": entry.path,
+            "kind": file_suffix(entry.name),
+            "size_bytes": stat.st_size,
+            "mtime": stat.st_mtime,
+            "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        }
 
-        results.append(
-            {
-                "start": group[0]["mtime"],
-                "end": group[-1]["mtime"],
-                "count": len(group),
-                "kinds": sorted({item["kind"] for item in group}),
-            }
-        )
-    return waves
 
+ArtifactTimeline = List[Tuple[float, str]]
 
-def prepare_ingest_dirs(repo_root: Path) -> dict[str, Path]:
-    mapping = {
-        "root": (repo_root / INGEST_ROOT_REL).resolve(),
-        "pending_raw": (repo_root / PENDING_RAW_REL).resolve(),
-        "pending_annot": (repo_root / PENDING_ANNOT_REL).resolve(),
-        "processed": (repo_root / PROCESSED_REL).resolve(),
-    }
-    for path in mapping.values():
-        if not path.exists():
-            path.mkdir(parents=True, exist_ok=True)
-    return mapping
 
+def detect_loglike(
+    files: Sequence[os.DirEntry],
+    sink: Optional[BinaryIO] = None,
+    limit: int = LOGLIKE_REPORT_LIMIT,
+) -> Tuple[List[Dict[str, object]], ArtifactTimeline]:
+    """Stream log artefacts and return the newest *limit* plus a timeline.
 
-def annotate_copy(source_path: Path, destination: Path, source_label: str) -> None:
-    with destination.open("w", encoding="utf-8") as target, source_path.open(
-        "r", encoding="utf-8", errors="ignore"
-    ) as original:
-        header = ANNOTATION_HEADER.format(timestamp=datetime.now().isoformat(), source=source_label)
-        target.write(header)
-        target.write(original.read())
+    Every artefact record is written to *sink* as one NDJSON line as soon as it
+    is found, so only the ``limit`` most recent full records and a compact
+    timeline of ``(mtime, kind)`` tuples (enough for
+    :func:`correlate_artifacts`) stay in memory.  The recent records are returned newest first.
+    """
 
+    recent: List[Tuple[float, int, Dict[str, object]]] = []
+    timeline: ArtifactTimeline = []
+    for index, entry in enumerate(iter_loglike(files)):
+        if sink is not None:
+            sink.write(dump_json_line(entry))
+        timeline.append((entry["mtime"], entry["kind"]))
+        item = (entry["mtime"], index, entry)
+        if len(recent) < limit:
+            heapq.heappush(recent, item)
+        elif limit:
+            heapq.heappushpop(recent, item)
+
+    newest_first = [entry for _, _, entry in sorted(recent, reverse=True)]
+    return newest_first, timeline
+
+
+def correlate_artifacts(
+    artifacts: Sequence[Tuple[float, str]],
+    window_sec: float = ARTIFACT_WINDOW_SEC,
+) -> List[Dict[str, object]]:
+    """Group ``(mtime, kind)`` artefacts whose times lie within *window_sec*.
 
-def process_priority_txt_with_namespace(
-    roots: List[Path],
-    repo_root: Path,
-    skip_paths: Iterable[Path],
-) -> list[dict]:
-    """Stage priority text files while preserving per-root namespaces."""
+    With ``numpy`` installed the ordering and the wave boundaries are computed
+    in a single vectorised pass (stable ``argsort`` + ``diff``); otherwise the
+    tuples are sorted and split in pure Python with identical results.
+    """
 
-    ingest_dirs = prepare_ingest_dirs(repo_root)
-    priority_docs: list[dict] = []
+    if not artifacts:
+        return []
 
-    repo_root_resolved = repo_root.resolve()
-    root_tokens: dict[Path, str] = {}
+    if np is not None:
+        mtimes = np.fromiter(
+            (mtime for mtime, _ in artifacts), dtype=np.float64, count=len(artifacts)
+        )
+        order = mtimes.argsort(kind="stable")
+        mtimes = mtimes[order]
+        splits = (np.flatnonzero(np.diff(mtimes) > window_sec) + 1).tolist()
+        bounds = [0, *splits, len(artifacts)]
+        indices = order.tolist()
+        return [
+            {
+                "start": float(mtimes[low]),
+                "end": float(mtimes[high - 1]),
+                "count": high - low,
+                "kinds": sorted({artifacts[index][1] for index in indices[low:high]}),
+            }
+            for low, high in zip(bounds, bounds[1:])
+        ]
+
+    timeline = sorted(artifacts)
+    waves: List[Dict[str, object]] = []
+    start = previous = timeline[0][0]
+    kinds: Set[object] = set()
+    count = 0
+    for mtime, kind in timeline:
+        if mtime - previous > window_sec:
+            waves.append({"start": start, "end": previous, "count": count, "kinds": sorted(kinds)})
+            start, kinds, count = mtime, set(), 0
+        kinds.add(kind)
+        count += 1
+        previous = mtime
+    waves.append({"start": start, "end": previous, "count": count, "kinds": sorted(kinds)})
+    return waves
 
-    for index, base in enumerate(roots):
-        resolved_base = base.resolve()
-        if resolved_base in root_tokens:
-            continue
 
+def _transfer(origin: BinaryIO, target: BinaryIO, size: int) -> None:
+    """Append *size* bytes of *origin* (read from offset 0) to *target*.
+
+    ``os.copy_file_range`` is tried first (reflink/CoW aware on btrfs and
+    xfs), then ``os.sendfile``; both keep the bytes inside the kernel. Whatever
+    remains is finished with a chunked ``copyfileobj``.
+    """
+
+    target.flush()
+    src_fd, dst_fd = origin.fileno(), target.fileno()
+    copied = 0
+    if hasattr(os, "copy_file_range"):
         try:
-            relative_label = resolved_base.relative_to(repo_root_resolved).as_posix()
-            if not relative_label:
-                relative_label = "repo_root"
-        except ValueError:
-            relative_label = resolved_base.name or "root"
-
-        sanitized = re.sub(r"[^A-Za-z0-9._-]", "_", relative_label)
-        root_tokens[resolved_base] = f"{index:02d}_{sanitized}"
-
-    for base in roots:
-        base_resolved = base.resolve()
-        root_token = root_tokens.get(base_resolved)
-        if not root_token:
-            continue
+            while copied < size:
+                step = os.copy_file_range(src_fd, dst_fd, size - copied, copied)
+                if step == 0:
+                    break
+                copied += step
+        except OSError:
+            pass
+    if copied < size and hasattr(os, "sendfile"):
+        try:
+            while copied < size:
+                step = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                if step == 0:
+                    break
+                copied += step
+        except OSError:
+            pass
+    if copied < size:
+        origin.seek(copied)
+        target.seek(0, os.SEEK_END)
+        copyfileobj(origin, target, length=COPY_CHUNK_BYTES)
 
-        for file_path in walk_files(base, skip_paths=skip_paths):
-            if file_path.suffix.lower() not in PRIORITY_TXT_EXT:
-                continue
-            if is_relative_to(file_path, ingest_dirs["root"]):
-                continue
 
-            try:
-                size_kb = os.path.getsize(file_path) / 1024
-            except OSError:
-                continue
+def copy_raw(source: PathInput, destination: Path, stat: os.stat_result) -> None:
+    """Copy *source* to *destination* and carry over its timestamps like ``copy2``."""
 
-            if size_kb < PRIORITY_THRESHOLD_KB:
-                continue
+    with open(source, "rb") as origin, destination.open("wb") as target:
+        _transfer(origin, target, stat.st_size)
+    os.utime(destination, ns=(stat.st_atime_ns, stat.st_mtime_ns))
 
-            try:
-                relative_path = file_path.resolve().relative_to(base_resolved)
-            except Exception:
-                relative_path = Path(file_path.name)
 
-            staged_relative = Path(root_token) / relative_path
+def is_staged(stat: os.stat_result, raw_target: Path, annot_target: Path) -> bool:
+    """Return ``True`` when both copies of a source with *stat* are current.
 
-            raw_dest = ingest_dirs["pending_raw"] / staged_relative
-            raw_dest.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                copy2(file_path, raw_dest)
-            except Exception:
-                continue
+    :func:`copy_raw` stamps the source mtime onto the raw copy, so an equal
+    size and ``st_mtime_ns`` mean the source has not changed since it was
+    staged.  :func:`write_priority_copies` applies that stamp last, so a
+    twin left incomplete by a failed or interrupted run never passes.
+    """
 
-            annotated_name = relative_path.stem + "_annotated" + relative_path.suffix
-            annotated_path = staged_relative.with_name(annotated_name)
-            annot_dest = ingest_dirs["pending_annot"] / annotated_path
-            annot_dest.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                annotate_copy(file_path, annot_dest, source_label=str(staged_relative))
-            except Exception:
-                try:
-                    raw_dest.unlink(missing_ok=True)
-                except Exception:
-                    pass
-                continue
+    try:
+        staged = os.stat(raw_target)
+    except OSError:
+        return False
+    return (
+        staged.st_size == stat.st_size
+        and staged.st_mtime_ns == stat.st_mtime_ns
+        and annot_target.exists()
+    )
 
-            priority_docs.append(
-                {
-                    "original": str(file_path.resolve()),
-                    "relative_to_root": rel_to(base, file_path),
-                    "staged_relative": str(staged_relative),
-                    "size_kb": round(size_kb, 2),
-                    "raw_copy": str(raw_dest.resolve()),
-                    "annotated_copy": str(annot_dest.resolve()),
-                }
-            )
 
-    return priority_docs
-                "source": str(path),
-                "copied_raw": str(raw_target),
-                "copied_annotated": str(annot_target),
-                "size_kb": round(size_kb, 2),
-                "modified_at": timestamp,
-            }
-        )
-    return summary
+def write_annotated_copy(source: PathInput, destination: Path, header: str, size: int) -> None:
+    """Write *header* followed by the raw bytes of *source* into *destination*."""
 
+    with destination.open("wb") as target, open(source, "rb") as origin:
+        target.write(header.encode("utf-8"))
+        _transfer(origin, target, size)
 
-def prepare_ingest_dirs() -> None:
-    for directory in (RAW_DIR, ANNOT_DIR, PROC_DIR):
-        directory.mkdir(parents=True, exist_ok=True)
 
+def write_priority_copies(
+    source: str,
+    raw_target: Path,
+    annot_target: Path,
+    header: str,
+    stat: os.stat_result,
+) -> None:
+    """Write the annotated twin and the raw copy of *source*.
 
-def copy_priority_texts(roots: Iterable[Path]) -> List[Dict[str, object]]:
-    """Extract high-priority text documents into the evo_ingest pipeline."""
+    The raw copy's source mtime is the commit marker checked by
+    :func:`is_staged`, so the annotated twin is written first and the stamp
+    is applied last.  Up to ``FUSED_COPY_MAX_BYTES`` the source is read once and both copies
+    are written from that buffer; larger corpora are streamed in-kernel by
+    :func:`copy_raw` and :func:`write_annotated_copy` instead of being held
+    in memory.
+    """
 
-    ensure_ingest_dirs()
-    catalog: List[Dict[str, object]] = []
-def create_annotation(source: Path, destination: Path, relative_path: str) -> None:
-    with destination.open("w", encoding="utf-8") as target, source.open(
-        "r", encoding="utf-8", errors="ignore"
-    ) as origin:
-        target.write(f"{ANNOTATION_HEADER} {datetime.now().isoformat()}\n")
-        target.write(f"# Source: {relative_path}\n")
-        target.write("# Architecture reflection: awaiting analysis...\n\n")
-        target.write(origin.read())
+    if stat.st_size > FUSED_COPY_MAX_BYTES:
+        write_annotated_copy(source, annot_target, header, stat.st_size)
+        copy_raw(source, raw_target, stat)
+        return
 
+    with open(source, "rb") as origin:
+        data = origin.read()
+    with annot_target.open("wb") as target:
+        target.write(header.encode("utf-8"))
+        target.write(data)
+    with raw_target.open("wb") as target:
+        target.write(data)
+    os.utime(raw_target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
 
-def process_priority_txt(roots: List[Path]) -> List[Dict[str, object]]:
-    """Copy prioritized text files into the ingest staging area with annotations."""
 
-    prepare_ingest_dirs()
-    prioritized: List[Dict[str, object]] = []
+def _utc_timestamp() -> str:
+    """Return the current UTC time as ISO 8601 with a ``Z`` suffix."""
 
-    for base in roots:
-        for file_path in walk_files(base):
-            if file_path.suffix.lower() not in PRIORITY_TXT_EXT:
-                continue
+    return datetime.utcnow().isoformat() + "Z"
 
-            try:
-                size_kb = os.path.getsize(file_path) / 1024
-            except OSError:
-                continue
 
-            if size_kb < PRIORITY_THRESHOLD_KB:
-                continue
+def collect_priority_texts(
+    repo_root: Path,
+    files: Sequence[os.DirEntry],
+    ingest_paths: Dict[str, Path],
+    run_timestamp: Optional[str] = None,
+    max_workers: int = PRIORITY_COPY_WORKERS,
+) -> List[Dict[str, object]]:
+    """Copy large text files into the ingest pipeline and annotate them.
 
-            try:
-                relative_path = file_path.resolve().relative_to(base.resolve())
-            except ValueError:
-                relative_path = Path(file_path.name)
+    *files* is the ``KIND_TXT`` bucket produced by :func:`classify_files`.
+    Every annotation header carries the same *run_timestamp* (defaults to
+    the UTC time of the call, formatted like ``generated_at``).  Candidates are selected on the calling thread;
+    the copies themselves are pure I/O and run on a thread pool, with the
+    results kept in input order.
+    """
 
-            raw_destination = RAW_DIR / relative_path
-            raw_destination.parent.mkdir(parents=True, exist_ok=True)
+    if run_timestamp is None:
+        run_timestamp = _utc_timestamp()
 
-            annotated_relative = relative_path.with_name(
-                f"{relative_path.stem}_annotated{relative_path.suffix}"
-            )
-            annotated_destination = ANNOT_DIR / annotated_relative
-            annotated_destination.parent.mkdir(parents=True, exist_ok=True)
+    ingest_prefix = dir_prefix(ingest_paths["ingest_root"])
+    repo_prefix = dir_prefix(repo_root)
 
+    candidates: List[Tuple[str, os.stat_result, Path, Path]] = []
+    for entry in files:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if stat.st_size / 1024.0 < PRIORITY_THRESHOLD_KB:
+            continue
+        path = entry.path
+        if path.startswith(ingest_prefix):
+            # Never re-ingest our own staging area.
+            continue
+        if path.startswith(repo_prefix):
+            target_relative = Path(path[len(repo_prefix):])
+        else:
+            # External corpora (``/sdcard`` ...) often share basenames; a
+            # digest of the source directory keeps their targets distinct so
+            # two workers never write the same file.
+            parent_digest = hashlib.sha1(os.fsencode(os.path.dirname(path))).hexdigest()[:10]
+            target_relative = Path(EXTERNAL_STAGE_DIR, parent_digest, entry.name)
+        raw_target = ingest_paths["raw"] / target_relative
+        annot_target = ingest_paths["annotated"] / target_relative.with_suffix(".annotated.txt")
+        candidates.append((path, stat, raw_target, annot_target))
+
+    # Many corpora share a handful of directories; create each one only once.
+    # ``mkdir(exist_ok=True)`` tolerates two workers racing on the same one.
+    created_dirs: Set[Path] = set()
+
+    def stage(candidate: Tuple[str, os.stat_result, Path, Path]) -> Optional[Dict[str, object]]:
+        path, stat, raw_target, annot_target = candidate
+        if not is_staged(stat, raw_target, annot_target):
+            for parent in (raw_target.parent, annot_target.parent):
+                if parent not in created_dirs:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(parent)
+            header = ANNOTATION_TEMPLATE.format(timestamp=run_timestamp, source=path)
             try:
-                copy2(file_path, raw_destination)
-                create_annotation(file_path, annotated_destination, str(relative_path))
-            except Exception:
-                # Ensure partial copies do not linger when annotation fails.
-                try:
-                    raw_destination.unlink(missing_ok=True)
-                except Exception:
-                    pass
-                continue
+                write_priority_copies(path, raw_target, annot_target, header, stat)
+            except OSError:
+                return None
+        return {
+            "source": path,
+            "copied_raw": str(raw_target),
+            "copied_annotated": str(annot_target),
+            "size_kb": round(stat.st_size / 1024.0, 2),
+            "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        }
+
+    if max_workers > 1 and len(candidates) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            staged = list(executor.map(stage, candidates))
+    else:
+        staged = [stage(candidate) for candidate in candidates]
+    return [record for record in staged if record is not None]
 
-            prioritized.append(
-                {
-                    "path": str(relative_path),
-                    "size_kb": round(size_kb, 2),
-                    "raw_copy": str(raw_destination.resolve()),
-                    "annotated_copy": str(annotated_destination.resolve()),
-                    "priority": 1.0,
-                }
-            )
 
-    return prioritized
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
 
+def _format_epoch(value: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value))
 
-def write_outputs(out_dir: Path, payload: dict) -> None:
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    with (out_dir / "evo_dependency_map.json").open("w", encoding="utf-8") as fp:
-        json.dump(payload, fp, ensure_ascii=False, indent=2)
+def write_json_file(path: Path, payload: object) -> None:
+    """Write *payload* to *path* as indented UTF-8 JSON.
 
-    report_lines: list[str] = []
-    report_lines.append(f"[EvoDependencyScanner] {payload['timestamp']}")
-    report_lines.append(f"Roots: {', '.join(payload['roots'])}")
-    report_lines.append(f"Files with imports: {payload['stats']['files_with_imports']}")
-    report_lines.append(f"Unique imports observed: {payload['stats']['unique_imports']}")
-    report_lines.append("")
+    With ``orjson`` a dict payload is encoded one top-level value at a time
+    and re-indented under its key, so only the largest value (the import
+    maps) is ever held as bytes, never the whole document; the output is
+    byte-identical to a single ``OPT_INDENT_2`` dump.  Without it the stdlib
+    encoder streams chunks into the file via ``json.dump``.
+    """
 
-    report_lines.append("Top files by outgoing imports:")
-    for name, count in payload["magnets"]["top_outgoing"]:
-        report_lines.append(f"  - {name}  → {count}")
-    report_lines.append("")
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2
+        if not isinstance(payload, dict) or not payload:
+            path.write_bytes(orjson.dumps(payload, option=option))
+            return
+        with path.open("wb") as handle:
+            separator = b"{\n  "
+            for key, value in payload.items():
+                handle.write(separator)
+                handle.write(orjson.dumps(key))
+                handle.write(b": ")
+                # JSON strings never contain a raw newline, so every newline
+                # in the encoded value is a line break to indent.
+                handle.write(orjson.dumps(value, option=option).replace(b"\n", b"\n  "))
+                separator = b",\n  "
+            handle.write(b"\n}")
+        return
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+
+
+def dump_json_line(record: object) -> bytes:
+    """Serialise *record* as a single compact NDJSON line."""
+
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
 
-    report_lines.append("Top import targets by incoming refs:")
-    for name, count in payload["magnets"]["top_incoming"]:
-        report_lines.append(f"  - {name}  ← {count}")
-    report_lines.append("")
 
-    report_lines.append("Artifact waves (logs/cache/tmp):")
-    return catalog
+def write_outputs(out_dir: Path, payload: Dict[str, object]) -> None:
+    """Persist the JSON map and the human readable report into *out_dir*."""
 
-    return results
+    out_dir.mkdir(parents=True, exist_ok=True)
+    write_json_file(out_dir / "evo_dependency_map.json", payload)
+
+    # A 1 MiB buffer lets the many small writes below reach the disk in a
+    # handful of syscalls without ever joining the report into one string.
+    report_path = out_dir / "evo_dependency_report.log"
+    with report_path.open("w", encoding="utf-8", buffering=REPORT_BUFFER_BYTES) as report_file:
+        write = report_file.write
+        write(f"Evo Dependency Scan :: {payload['generated_at']}\n")
+        write("Roots:\n")
+        for root in payload["scanned_roots"]:
+            write(f"  - {root}\n")
+        write(f"Python files scanned: {payload['python_files']}\n")
+        write(f"Unique imports observed: {len(payload['reverse_imports'])}\n\n")
+
+        write("[Top files by outgoing imports]\n")
+        for name, value in payload["magnets"]["top_outgoing"]:
+            write(f"  - {name}  → {value}\n")
+        write("\n[Top import targets by incoming refs]\n")
+        for name, value in payload["magnets"]["top_incoming"]:
+            write(f"  - {name}  ← {value}\n")
+
+        write("\n[Artifact waves (logs/cache/tmp)]\n")
+        for wave in payload["artifact_waves"]:
+            write(
+                f"  - [{_format_epoch(wave['start'])} … {_format_epoch(wave['end'])}]"
+                f"  count={wave['count']} kinds={','.join(wave['kinds'])}\n"
+            )
+        if not payload["artifact_waves"]:
+            write("  (none detected)\n")
+
+        write(
+            f"\n[Log artefacts] newest {len(payload['loglike_entries'])}"
+            f" of {payload['loglike_total']}"
+            f" (full stream: {payload['artifacts_ndjson'] or 'not written'})\n"
+        )
+        for entry in payload["loglike_entries"]:
+            write(f"  - {entry['modified_at']} | {entry['size_bytes']} B | {entry['path']}\n")
+        if not payload["loglike_entries"]:
+            write("  (none detected)\n")
+
+        write(f"\n[Priority corpora (>{PRIORITY_THRESHOLD_KB} KB)]\n")
+        for entry in payload["priority_texts"]:
+            write(
+                "  - {modified_at} | {size_kb} KB | {source}\n"
+                "    raw -> {copied_raw}\n"
+                "    annotated -> {copied_annotated}\n".format(**entry)
+            )
+        if not payload["priority_texts"]:
+            write("  (none detected)\n")
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def run_scan(extra_roots: Optional[Sequence[str]] = None) -> Dict[str, object]:
-    """Execute the dependency scan and return a structured payload."""
-
-def write_outputs(out_dir: Path, payload: Dict[str, object]) -> None:
-    out_dir.mkdir(parents=True, exist_ok=True)
-    with (out_dir / "evo_dependency_map.json").open("w", encoding="utf-8") as json_file:
-        json.dump(payload, json_file, ensure_ascii=False, indent=2)
-
-    report_lines = [
-        f"[EvoDependencyScanner] {payload['timestamp']}",
-        f"Roots: {', '.join(payload['roots'])}",
-        f"Files with imports: {payload['stats']['files_with_imports']}",
-        f"Unique imports observed: {payload['stats']['unique_imports']}",
-        "",
-        "Top files by outgoing imports:",
-    ]
-    for name, value in payload["magnets"]["top_outgoing"]:
-        report_lines.append(f"  - {name}  → {value}")
-    report_lines.append("")
-    report_lines.append("Top import targets by incoming refs:")
-    for name, value in payload["magnets"]["top_incoming"]:
-        report_lines.append(f"  - {name}  ← {value}")
-    report_lines.append("")
-    report_lines.append("Artifact waves (logs/cache/tmp):")
-    for wave in payload["artifact_waves"]:
-        start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(wave["start"]))
-        end = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(wave["end"]))
-        report_lines.append(
-            f"  - [{start} … {end}]  count={wave['count']} kinds={','.join(wave['kinds'])}"
-        )
-    report_lines.append("")
-    report_lines.append("High-priority .txt documents (>10 KB):")
-    for document in payload.get("priority_docs", [])[:50]:
-        report_lines.append(
-            "  • {source} (staged: {staged})  ({size} KB)  → raw={raw} annotated={annot}".format(
-                source=document.get("relative_to_root") or document.get("original"),
-                staged=document.get("staged_relative") or document.get("relative_to_root"),
-                size=document.get("size_kb", "?"),
-                raw=document.get("raw_copy", "?"),
-                annot=document.get("annotated_copy", "?"),
-            )
-        )
-    with (out_dir / "evo_dependency_report.log").open("w", encoding="utf-8") as report_file:
-        report_file.write("\n".join(report_lines))
+def run_scan(
+    extra_roots: Optional[Sequence[str]] = None,
+    out_dir: Optional[Path] = None,
+    window_sec: float = ARTIFACT_WINDOW_SEC,
+    precise: bool = False,
+) -> Dict[str, object]:
+    """Execute the dependency scan and return a structured payload.
 
+    *precise* switches the import scan to ``ast`` parsing (see
+    :func:`build_import_maps`).
+    """
 
-def main(argv: List[str] | None = None) -> None:
-    parser = argparse.ArgumentParser("EvoDependencyScanner")
-    parser.add_argument("--roots", nargs="*", help="Дополнительные корни для сканирования")
-    parser.add_argument("--out", default="logs", help="Каталог для вывода логов/JSON")
-    parser.add_argument(
-        "--window", type=int, default=30, help="Окно корреляции артефактов (секунды)"
-    )
-    args = parser.parse_args(argv)
     repo_root = detect_env_root()
     roots = list_roots(extra_roots)
     ingest_paths = ensure_ingest_dirs(repo_root)
 
-    files = list(iter_files(roots))
-    py_files = [path for path in files if path.suffix.lower() in PY_EXT]
+    # Staged corpora are our own output: never walk back into them.
+    buckets = classify_files(
+        roots, skip_roots=[ingest_paths["ingest_root"]], workers=SCANDIR_WORKERS
+    )
+    # DirEntry objects are path-like; passing them lets parse_imports reuse
+    # the cached stat to skip stub files without opening them.
+    py_files = buckets[KIND_CODE]
 
-    dependency_data = build_dependency_graph(roots, skip_paths=skip_paths)
-    magnets = rank_magnets(dependency_data["graph"], dependency_data["reverse"])
-    artifact_waves = correlate_artifacts(dependency_data["artifacts"], window_sec=args.window)
-    priority_docs = process_priority_txt_with_namespace(
-        roots, repo_root, skip_paths=skip_paths
+    output_dir = out_dir if out_dir is not None else repo_root / "logs"
+    artifacts_path: Optional[Path] = output_dir / ARTIFACTS_NDJSON_NAME
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        sink: Optional[BinaryIO] = artifacts_path.open("wb")
+    except OSError:
+        sink = None
+        artifacts_path = None
+
+    # Unchanged files are answered from the previous run's cache.
+    cache_path = output_dir / IMPORT_CACHE_NAME
+    import_cache = load_import_cache(cache_path, precise)
+    forward, reverse = build_import_maps(
+        py_files, cache=import_cache, base=repo_root, precise=precise
+    )
+    try:
+        save_import_cache(cache_path, import_cache, precise)
+    except OSError:
+        pass
+    try:
+        loglike_entries, artifact_timeline = detect_loglike(buckets[KIND_LOG], sink=sink)
+    finally:
+        if sink is not None:
+            sink.close()
+    artifact_waves = correlate_artifacts(artifact_timeline, window_sec=window_sec)
+    generated_at = _utc_timestamp()
+    priority_corpus = collect_priority_texts(
+        repo_root, buckets[KIND_TXT], ingest_paths, run_timestamp=generated_at
     )
-    forward, reverse = build_import_maps(py_files)
-    loglike_entries = detect_loglike(files)
-    priority_corpus = collect_priority_texts(repo_root, files, ingest_paths)
 
-    payload = {
-        "generated_at": datetime.utcnow().isoformat() + "Z",
+    payload: Dict[str, object] = {
+        "generated_at": generated_at,
         "scanned_roots": [str(root) for root in roots],
         "python_files": len(py_files),
         "forward_imports": forward,
         "reverse_imports": reverse,
+        "magnets": rank_magnets(forward, reverse),
         "loglike_entries": loglike_entries,
-        "priority_texts": priority_corpus,
-    }
-
-if __name__ == "__main__":
-    sys.exit(main())
-    data = build_dependency_graph(roots)
-    magnets = rank_magnets(data["graph"], data["reverse"])
-    artifact_waves = correlate_artifacts(data["artifacts"], window_sec=args.window)
-    priority_docs = process_priority_txt_with_namespace(roots, repo_root, skip_paths=[])
-
-    payload = {
-        "timestamp": datetime.now().isoformat(),
-        "roots": [str(root) for root in roots],
-        "graph": data["graph"],
-        "reverse": data["reverse"],
-        "artifacts": data["artifacts"],
+        "loglike_total": len(artifact_timeline),
+        "artifacts_ndjson": str(artifacts_path) if artifacts_path is not None else None,
         "artifact_waves": artifact_waves,
-        "magnets": magnets,
-        "stats": {
-            "files_with_imports": len(data["graph"]),
-            "unique_imports": len(data["reverse"]),
-        },
-        "priority_docs": priority_docs,
+        "priority_texts": priority_corpus,
     }
-    output_dir = repo_root / "logs"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    json_path = output_dir / "evo_dependency_map.json"
-    log_path = output_dir / "evo_dependency_report.log"
 
     try:
-        json_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
-    except OSError:
-        pass
-
-    try:
-        with log_path.open("w", encoding="utf-8") as handle:
-            handle.write(f"Evo Dependency Scan :: {payload['generated_at']}\n")
-            handle.write("Roots:\n")
-            for root in payload["scanned_roots"]:
-                handle.write(f"  - {root}\n")
-            handle.write(f"Python files scanned: {payload['python_files']}\n\n")
-
-            handle.write("[Log artefacts]\n")
-            for entry in payload["loglike_entries"]:
-                handle.write(
-                    f"  - {entry['modified_at']} | {entry['size_bytes']} B | {entry['path']}\n"
-                )
-            if not payload["loglike_entries"]:
-                handle.write("  (none detected)\n")
-
-            handle.write("\n[Priority corpora]\n")
-            for entry in payload["priority_texts"]:
-                handle.write(
-                    "  - {modified_at} | {size_kb} KB | {source}\n"
-                    "    raw -> {copied_raw}\n"
-                    "    annotated -> {copied_annotated}\n".format(**entry)
-                )
-            if not payload["priority_texts"]:
-                handle.write("  (none detected)\n")
+        write_outputs(output_dir, payload)
     except OSError:
         pass
 
@@ -662,13 +1135,37 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="Additional directories to include in the scan.",
     )
+    parser.add_argument(
+        "--out",
+        default=None,
+        help="Directory receiving the JSON map and report (defaults to <repo>/logs).",
+    )
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=ARTIFACT_WINDOW_SEC,
+        help="Artefact correlation window in seconds.",
+    )
+    parser.add_argument(
+        "--precise",
+        action="store_true",
+        help="Parse imports with ast instead of the regex (slower, exact).",
+    )
     return parser
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
-    run_scan(args.roots)
+    out_dir = Path(args.out).expanduser() if args.out else None
+    payload = run_scan(args.roots, out_dir=out_dir, window_sec=args.window, precise=args.precise)
+    summary = {
+        "python_files": payload["python_files"],
+        "unique_imports": len(payload["reverse_imports"]),
+        "artifact_waves": len(payload["artifact_waves"]),
+        "priority_texts": len(payload["priority_texts"]),
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
     return 0
 
 
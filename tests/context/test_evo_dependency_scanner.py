@@ -0,0 +1,584 @@
+"""Tests for the EvoDependencyScanner helpers."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+from apps.core.context import evo_dependency_scanner as scanner
+
+
+def _write(path: Path, content: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_detect_env_root_is_memoised() -> None:
+    assert scanner.detect_env_root() is scanner.detect_env_root()
+    assert (scanner.detect_env_root() / ".git").exists()
+
+
+def test_ensure_ingest_dirs_creates_once_and_returns_copies(tmp_path: Path) -> None:
+    first = scanner.ensure_ingest_dirs(tmp_path)
+    assert all(path.is_dir() for path in first.values())
+
+    first["raw"].rmdir()
+    first["extra"] = tmp_path
+    second = scanner.ensure_ingest_dirs(tmp_path)
+    assert "extra" not in second
+    assert not second["raw"].exists()
+
+    scanner.reset_root_caches()
+    assert scanner.ensure_ingest_dirs(tmp_path)["raw"].is_dir()
+
+
+def test_iter_files_skips_noisy_directories(tmp_path: Path) -> None:
+    _write(tmp_path / "pkg" / "mod.py", "import os\n")
+    _write(tmp_path / "__pycache__" / "mod.py", "import sys\n")
+    _write(tmp_path / "node_modules" / "lib" / "index.py", "import json\n")
+    _write(tmp_path / ".thumbnails" / "cache.py", "import re\n")
+
+    files = list(scanner.iter_files([tmp_path]))
+
+    assert [entry.name for entry in files] == ["mod.py"]
+    assert Path(files[0].path).parent.name == "pkg"
+    assert [entry.path for entry in scanner.iter_files([tmp_path], workers=4)] == [files[0].path]
+
+
+def test_iter_files_prunes_skip_roots(tmp_path: Path) -> None:
+    _write(tmp_path / "keep" / "mod.py", "import os\n")
+    _write(tmp_path / "data" / "evo_ingest" / "pending" / "raw" / "corpus.txt", "x")
+
+    files = list(scanner.iter_files([tmp_path], skip_roots=[tmp_path / "data" / "evo_ingest"]))
+
+    assert [entry.name for entry in files] == ["mod.py"]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_iter_files_walks_nested_roots_once(tmp_path: Path, workers: int) -> None:
+    _write(tmp_path / "outer.py", "import os\n")
+    _write(tmp_path / "inner" / "mod.py", "import sys\n")
+
+    inner_first = [
+        entry.name for entry in scanner.iter_files([tmp_path / "inner", tmp_path], workers=workers)
+    ]
+    outer_first = [
+        entry.name for entry in scanner.iter_files([tmp_path, tmp_path / "inner"], workers=workers)
+    ]
+
+    assert sorted(inner_first) == sorted(outer_first) == ["mod.py", "outer.py"]
+
+
+class _ZeroInodeEntry:
+    """``DirEntry`` stand-in whose ``stat()`` zeroes the inode like Windows."""
+
+    def __init__(self, entry: os.DirEntry) -> None:
+        self._entry = entry
+
+    def __getattr__(self, name: str):
+        return getattr(self._entry, name)
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        stat = self._entry.stat(follow_symlinks=follow_symlinks)
+        return os.stat_result((stat.st_mode, 0, 0, *tuple(stat)[3:10]))
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("stat_has_inodes", [True, False])
+def test_iter_files_walks_sibling_directories_without_inodes(
+    monkeypatch, tmp_path: Path, workers: int, stat_has_inodes: bool
+) -> None:
+    for relative in ["top.py", "a/x.py", "b/y.py", "b/c/z.py", "d/w.py"]:
+        _write(tmp_path / relative, "import os\n")
+    real_scandir = os.scandir
+
+    class ZeroInodeListing:
+        def __init__(self, path: str) -> None:
+            self._listing = real_scandir(path)
+
+        def __enter__(self) -> "ZeroInodeListing":
+            return self
+
+        def __exit__(self, *exc_info: object) -> None:
+            self._listing.close()
+
+        def __iter__(self):
+            return (_ZeroInodeEntry(entry) for entry in self._listing)
+
+    monkeypatch.setattr(scanner.os, "scandir", ZeroInodeListing)
+    if not stat_has_inodes:
+        real_stat = os.stat
+
+        def zero_inode_stat(path, *, follow_symlinks=True):
+            stat = real_stat(path, follow_symlinks=follow_symlinks)
+            return os.stat_result((stat.st_mode, 0, 0, *tuple(stat)[3:10]))
+
+        monkeypatch.setattr(scanner.os, "stat", zero_inode_stat)
+
+    names = sorted(entry.name for entry in scanner.iter_files([tmp_path], workers=workers))
+
+    assert names == ["top.py", "w.py", "x.py", "y.py", "z.py"]
+
+
+def test_classify_files_buckets_by_suffix(tmp_path: Path) -> None:
+    _write(tmp_path / "mod.PY", "import os\n")
+    _write(tmp_path / "run.log", "x")
+    _write(tmp_path / "notes" / "corpus.txt", "x")
+    _write(tmp_path / "image.png", "x")
+
+    buckets = scanner.classify_files([tmp_path])
+
+    assert {kind: [entry.name for entry in entries] for kind, entries in buckets.items()} == {
+        scanner.KIND_CODE: ["mod.PY"],
+        scanner.KIND_LOG: ["run.log"],
+        scanner.KIND_TXT: ["corpus.txt"],
+    }
+
+
+def test_classify_files_pooled_walk_is_sorted(tmp_path: Path) -> None:
+    for relative in ["b/y.py", "a/x.py", "top.py", "d/e/w.py", "c/z.py"]:
+        _write(tmp_path / relative, "import os\n")
+
+    pooled = scanner.classify_files([tmp_path], workers=4)[scanner.KIND_CODE]
+
+    paths = [entry.path for entry in pooled]
+    assert paths == sorted(paths)
+    assert len(paths) == 5
+
+
+def test_import_maps_are_built_from_top_level_modules(tmp_path: Path) -> None:
+    first = _write(
+        tmp_path / "first.py",
+        "import os\nimport os.path\nfrom collections import abc\n",
+    )
+    second = _write(tmp_path / "second.py", "    from os import sep\nimport json\n")
+
+    forward, reverse = scanner.build_import_maps([first, second])
+    assert scanner.build_import_maps([first, second], max_workers=1) == (forward, reverse)
+    assert scanner.build_import_maps([first, second, first]) == (forward, reverse)
+
+    assert forward[str(first)] == ["collections", "os"]
+    assert forward[str(second)] == ["json", "os"]
+    assert reverse["os"] == sorted([str(first), str(second)])
+    assert reverse["json"] == [str(second)]
+
+    magnets = scanner.rank_magnets(forward, reverse, limit=1)
+    assert magnets["top_incoming"] == [("os", 2)]
+
+
+def test_import_maps_use_keys_relative_to_base(tmp_path: Path) -> None:
+    root = tmp_path.resolve()
+    inside = _write(root / "repo" / "pkg" / "mod.py", "import os\n")
+    outside = _write(root / "shared" / "tool.py", "import os\n")
+
+    forward, reverse = scanner.build_import_maps([inside, outside], base=root / "repo")
+
+    relative = os.path.join("pkg", "mod.py")
+    assert forward == {relative: ["os"], str(outside): ["os"]}
+    assert reverse == {"os": sorted([relative, str(outside)])}
+
+
+def test_import_cache_skips_unchanged_files(monkeypatch, tmp_path: Path) -> None:
+    first = _write(tmp_path / "first.py", "import os\n")
+    second = _write(tmp_path / "second.py", "import json\n")
+    cache_path = tmp_path / scanner.IMPORT_CACHE_NAME
+
+    cache = scanner.load_import_cache(cache_path)
+    assert cache == {}
+    expected = scanner.build_import_maps([first, second], cache=cache)
+    scanner.save_import_cache(cache_path, cache)
+    assert set(cache) == {str(first), str(second)}
+
+    parsed = []
+    original = scanner.parse_imports
+
+    def tracking_parse(path, precise=False):
+        parsed.append(path)
+        return original(path, precise)
+
+    monkeypatch.setattr(scanner, "parse_imports", tracking_parse)
+    _write(second, "import sys\n")
+    os.utime(second, ns=(0, 10**9))
+
+    cache = scanner.load_import_cache(cache_path)
+    forward, reverse = scanner.build_import_maps([first, second], max_workers=1, cache=cache)
+
+    assert parsed == [second]
+    assert forward == {str(first): ["os"], str(second): ["sys"]}
+    assert reverse == {"os": [str(first)], "sys": [str(second)]}
+    assert expected[0][str(first)] == forward[str(first)]
+
+    scanner.build_import_maps([second], max_workers=1, cache=cache)
+    assert set(cache) == {str(second)}
+
+    scanner.save_import_cache(cache_path, cache)
+    assert scanner.load_import_cache(cache_path) == cache
+    signature = cache[str(second)][:2]
+    for modules in ([1], "sys", {"sys": 1}):
+        cache[str(second)] = [*signature, modules]
+        parsed.clear()
+        forward, _ = scanner.build_import_maps([second], max_workers=1, cache=cache)
+        assert parsed == [second]
+        assert forward == {str(second): ["sys"]}
+
+    monkeypatch.setattr(scanner, "IMPORT_PATTERN_SOURCE", rb"^import\s+(\w+)()")
+    assert scanner.load_import_cache(cache_path) == {}
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_correlate_artifacts_groups_by_window(monkeypatch, use_numpy: bool) -> None:
+    if use_numpy and scanner.np is None:
+        pytest.skip("numpy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(scanner, "np", None)
+    artifacts = [(100.0, "log"), (10.0, "tmp"), (0.0, "log"), (130.0, "cache")]
+
+    waves = scanner.correlate_artifacts(artifacts, window_sec=30)
+
+    assert [(wave["start"], wave["end"], wave["count"]) for wave in waves] == [
+        (0.0, 10.0, 2),
+        (100.0, 130.0, 2),
+    ]
+    assert waves[0]["kinds"] == ["log", "tmp"]
+    assert waves[1]["kinds"] == ["cache", "log"]
+    assert scanner.correlate_artifacts([], window_sec=30) == []
+
+
+def test_collect_priority_texts_stages_large_files(tmp_path: Path) -> None:
+    repo_root = tmp_path / "repo"
+    large = _write(repo_root / "notes" / "corpus.txt", "evo\n" * 4096)
+    _write(repo_root / "notes" / "small.txt", "tiny")
+    ingest_paths = scanner.ensure_ingest_dirs(repo_root)
+
+    files = scanner.classify_files([repo_root])[scanner.KIND_TXT]
+    staged = scanner.collect_priority_texts(repo_root, files, ingest_paths, run_timestamp="RUN")
+
+    assert [entry["source"] for entry in staged] == [str(large)]
+    raw_copy = Path(staged[0]["copied_raw"])
+    assert raw_copy == ingest_paths["raw"] / "notes" / "corpus.txt"
+    annotated = Path(staged[0]["copied_annotated"])
+    assert raw_copy.read_bytes() == large.read_bytes()
+    assert raw_copy.stat().st_mtime_ns == large.stat().st_mtime_ns
+    annotated_text = annotated.read_text(encoding="utf-8")
+    assert annotated_text.startswith("### [Evo Annotation] RUN\n")
+    assert annotated_text.endswith(large.read_text(encoding="utf-8"))
+
+    _write(repo_root / "more" / "second.txt", "trinity\n" * 2048)
+    files = scanner.classify_files([repo_root])[scanner.KIND_TXT]
+    pooled = scanner.collect_priority_texts(repo_root, files, ingest_paths, max_workers=4)
+    serial = scanner.collect_priority_texts(repo_root, files, ingest_paths, max_workers=1)
+    assert pooled == serial
+    assert sorted(entry["source"] for entry in pooled) == sorted(
+        [str(large), str(repo_root / "more" / "second.txt")]
+    )
+    assert (ingest_paths["raw"] / "more" / "second.txt").exists()
+    (repo_root / "more" / "second.txt").unlink()
+
+    # A second pass must not pick up the staged copies themselves, and leaves
+    # the copies of an unchanged source untouched.
+    annotated.write_text("reviewed", encoding="utf-8")
+    files = scanner.classify_files([repo_root])[scanner.KIND_TXT]
+    restaged = scanner.collect_priority_texts(repo_root, files, ingest_paths)
+    assert [entry["source"] for entry in restaged] == [str(large)]
+    assert annotated.read_text(encoding="utf-8") == "reviewed"
+
+    os.utime(large, ns=(large.stat().st_atime_ns, large.stat().st_mtime_ns + 10**9))
+    files = scanner.classify_files([repo_root])[scanner.KIND_TXT]
+    scanner.collect_priority_texts(repo_root, files, ingest_paths)
+    header = annotated.read_text(encoding="utf-8").partition("\n")[0]
+    assert header.startswith("### [Evo Annotation] ")
+    assert header.endswith("Z")
+
+
+def test_collect_priority_texts_keeps_same_named_external_sources_apart(tmp_path: Path) -> None:
+    repo_root = tmp_path / "repo"
+    ingest_paths = scanner.ensure_ingest_dirs(repo_root)
+    first = _write(tmp_path / "sdcard" / "a" / "notes.txt", "first\n" * 4096)
+    second = _write(tmp_path / "sdcard" / "b" / "notes.txt", "second\n" * 4096)
+
+    files = scanner.classify_files([tmp_path / "sdcard"])[scanner.KIND_TXT]
+    staged = scanner.collect_priority_texts(repo_root, files, ingest_paths, max_workers=4)
+
+    by_source = {entry["source"]: Path(entry["copied_raw"]) for entry in staged}
+    assert set(by_source) == {str(first), str(second)}
+    assert by_source[str(first)] != by_source[str(second)]
+    for source, raw_copy in by_source.items():
+        assert raw_copy.name == "notes.txt"
+        assert raw_copy.is_relative_to(ingest_paths["raw"] / scanner.EXTERNAL_STAGE_DIR)
+        assert raw_copy.read_bytes() == Path(source).read_bytes()
+
+
+@pytest.mark.parametrize("fused_limit", [1 << 20, 0])
+def test_interrupted_annotated_write_is_restaged(monkeypatch, tmp_path: Path, fused_limit: int) -> None:
+    monkeypatch.setattr(scanner, "FUSED_COPY_MAX_BYTES", fused_limit)
+    repo_root = tmp_path / "repo"
+    corpus = _write(repo_root / "notes" / "corpus.txt", "evo\n" * 4096)
+    ingest_paths = scanner.ensure_ingest_dirs(repo_root)
+    annotated = ingest_paths["annotated"] / "notes" / "corpus.annotated.txt"
+
+    real_open = Path.open
+
+    class FullDisk:
+        def __init__(self, handle) -> None:
+            self._handle = handle
+
+        def __enter__(self) -> "FullDisk":
+            return self
+
+        def __exit__(self, *exc_info: object) -> None:
+            self._handle.close()
+
+        def __getattr__(self, name: str):
+            return getattr(self._handle, name)
+
+        def write(self, data: bytes) -> int:
+            self._handle.write(data[:16])
+            raise OSError(28, "No space left on device")
+
+    def failing_open(self, *args, **kwargs):
+        handle = real_open(self, *args, **kwargs)
+        return FullDisk(handle) if self == annotated else handle
+
+    monkeypatch.setattr(Path, "open", failing_open)
+    files = scanner.classify_files([repo_root])[scanner.KIND_TXT]
+    assert scanner.collect_priority_texts(repo_root, files, ingest_paths, run_timestamp="RUN") == []
+
+    monkeypatch.setattr(Path, "open", real_open)
+    files = scanner.classify_files([repo_root])[scanner.KIND_TXT]
+    scanner.collect_priority_texts(repo_root, files, ingest_paths, run_timestamp="RUN")
+
+    assert annotated.read_bytes().endswith(corpus.read_bytes())
+
+
+def test_copies_fall_back_without_kernel_copy(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.delattr(os, "copy_file_range", raising=False)
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    source = _write(tmp_path / "corpus.txt", "evo\n" * 4096)
+
+    scanner.copy_raw(source, tmp_path / "raw.txt", source.stat())
+    scanner.write_annotated_copy(source, tmp_path / "annotated.txt", "# header\n", source.stat().st_size)
+
+    assert (tmp_path / "raw.txt").read_bytes() == source.read_bytes()
+    assert (tmp_path / "annotated.txt").read_bytes() == b"# header\n" + source.read_bytes()
+
+
+@pytest.mark.parametrize("fused_limit", [1 << 20, 0])
+def test_write_priority_copies_fused_and_streamed(monkeypatch, tmp_path: Path, fused_limit: int) -> None:
+    monkeypatch.setattr(scanner, "FUSED_COPY_MAX_BYTES", fused_limit)
+    source = _write(tmp_path / "corpus.txt", "evo\n" * 4096)
+    raw, annotated = tmp_path / "raw.txt", tmp_path / "annotated.txt"
+
+    scanner.write_priority_copies(str(source), raw, annotated, "# header\n", source.stat())
+
+    assert raw.read_bytes() == source.read_bytes()
+    assert raw.stat().st_mtime_ns == source.stat().st_mtime_ns
+    assert annotated.read_bytes() == b"# header\n" + source.read_bytes()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_outputs_emits_map_and_report(monkeypatch, tmp_path: Path, use_orjson: bool) -> None:
+    if use_orjson and scanner.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(scanner, "orjson", None)
+    payload = {
+        "generated_at": "2025-01-01T00:00:00Z",
+        "scanned_roots": [str(tmp_path)],
+        "python_files": 1,
+        "forward_imports": {"mod.py": ["os"]},
+        "reverse_imports": {"os": ["mod.py"]},
+        "magnets": {"top_outgoing": [("mod.py", 1)], "top_incoming": [("os", 1)]},
+        "loglike_entries": [],
+        "loglike_total": 0,
+        "artifacts_ndjson": None,
+        "artifact_waves": [],
+        "priority_texts": [],
+    }
+
+    scanner.write_outputs(tmp_path / "out", payload)
+
+    written = json.loads((tmp_path / "out" / "evo_dependency_map.json").read_text("utf-8"))
+    if use_orjson:
+        streamed = (tmp_path / "out" / "evo_dependency_map.json").read_bytes()
+        assert streamed == scanner.orjson.dumps(payload, option=scanner.orjson.OPT_INDENT_2)
+    assert written["reverse_imports"] == {"os": ["mod.py"]}
+    assert written["magnets"]["top_incoming"] == [["os", 1]]
+    report = (tmp_path / "out" / "evo_dependency_report.log").read_text("utf-8")
+    assert "mod.py  → 1" in report
+    assert "os  ← 1" in report
+    assert report.count("(none detected)") == 3
+
+
+def test_parse_imports_handles_import_free_and_non_utf8_files(tmp_path: Path) -> None:
+    docstring = '"""' + "x" * 2048 + '"""\n'
+    late = _write(tmp_path / "late.py", docstring + "import json\n")
+    empty = _write(tmp_path / "empty.py", "VALUE = 1\n")
+    binary = tmp_path / "binary.py"
+    binary.write_bytes(b"# \xff\xfe latin-1 comment\nimport os\n")
+
+    assert scanner.parse_imports(late) == {"json"}
+    assert scanner.parse_imports(empty) == set()
+    assert scanner.parse_imports(binary) == {"os"}
+    assert scanner.parse_imports(tmp_path / "missing.py") == set()
+
+
+def test_parse_imports_precise_mode_uses_ast(tmp_path: Path) -> None:
+    source = _write(
+        tmp_path / "mod.py",
+        'import os, json\nDOC = """\nimport fake\n"""\nfrom .sibling import x\n',
+    )
+    legacy = _write(tmp_path / "legacy.py", "import os\nprint 'py2'\n")
+    generated = _write(tmp_path / "generated.py", "import json\nx = " + "+".join(["a"] * 100_000) + "\n")
+
+    assert scanner.parse_imports(source) == {"os", "fake"}
+    assert scanner.parse_imports(source, precise=True) == {"os", "json"}
+    assert scanner.parse_imports(legacy, precise=True) == {"os"}
+    assert scanner.parse_imports(generated, precise=True) == {"json"}
+
+    cache_path = tmp_path / scanner.IMPORT_CACHE_NAME
+    scanner.save_import_cache(cache_path, {"mod.py": [0, 0, ["os"]]})
+    assert scanner.load_import_cache(cache_path, precise=True) == {}
+
+
+def test_parse_imports_skips_stub_files(tmp_path: Path) -> None:
+    _write(tmp_path / "__init__.py", "")
+    _write(tmp_path / "tiny.py", "x = 1\n")
+    _write(tmp_path / "short.py", "import x")
+
+    entries = {entry.name: entry for entry in scanner.iter_files([tmp_path])}
+
+    assert scanner.parse_imports(entries["__init__.py"]) == set()
+    assert scanner.parse_imports(entries["tiny.py"]) == set()
+    assert scanner.parse_imports(entries["short.py"]) == {"x"}
+    forward, _ = scanner.build_import_maps(list(entries.values()), max_workers=1)
+    assert forward[str(tmp_path / "__init__.py")] == []
+
+
+@pytest.fixture(params=["re", "re2"])
+def import_engine(request, monkeypatch):
+    """Run the import regex on the stdlib engine and, when installed, on re2."""
+
+    if request.param == "re2":
+        if scanner.re2 is None:
+            pytest.skip("re2 is not installed")
+    else:
+        monkeypatch.setattr(scanner, "re2", None)
+    scanner._import_pattern.cache_clear()
+    yield request.param
+    scanner._import_pattern.cache_clear()
+
+
+def test_parse_imports_memory_maps_large_files(monkeypatch, tmp_path: Path, import_engine: str) -> None:
+    monkeypatch.setattr(scanner, "MMAP_THRESHOLD_BYTES", 64)
+    large = _write(tmp_path / "large.py", "import json\n" + "VALUE = 1\n" * 64 + "from os import sep\n")
+    plain = _write(tmp_path / "plain.py", "VALUE = 1\n" * 64)
+
+    assert scanner.parse_imports(large) == {"json", "os"}
+    assert scanner.parse_imports(plain) == set()
+
+
+def test_detect_loglike_streams_records_and_keeps_newest(tmp_path: Path) -> None:
+    paths = []
+    for index, name in enumerate(["a.log", "b.tmp", "c.cache"]):
+        path = _write(tmp_path / name, "x")
+        os.utime(path, (1000 + index, 1000 + index))
+        paths.append(path)
+    _write(tmp_path / "ignored.md", "x")
+
+    sink = io.BytesIO()
+    files = scanner.classify_files([tmp_path])[scanner.KIND_LOG]
+    recent, timeline = scanner.detect_loglike(files, sink=sink, limit=2)
+
+    assert [entry["path"] for entry in recent] == [str(paths[2]), str(paths[1])]
+    assert sorted(timeline) == [
+        (1000.0, "log"),
+        (1001.0, "tmp"),
+        (1002.0, "cache"),
+    ]
+    streamed = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert sorted(record["path"] for record in streamed) == sorted(str(path) for path in paths)
+
+
+def test_list_roots_deduplicates_symlinked_extras(tmp_path: Path) -> None:
+    target = tmp_path / "target"
+    target.mkdir()
+    alias = tmp_path / "alias"
+    alias.symlink_to(target, target_is_directory=True)
+
+    roots = scanner.list_roots([str(target), str(alias), str(tmp_path / "missing")])
+
+    assert roots[0] == scanner.detect_env_root()
+    assert roots.count(target.resolve()) == 1
+    assert alias not in roots
+
+    roots.append(tmp_path)
+    cached = scanner.list_roots([str(target), str(alias), str(tmp_path / "missing")])
+    assert tmp_path not in cached
+
+    (tmp_path / "missing").mkdir()
+    scanner.reset_root_caches()
+    refreshed = scanner.list_roots([str(target), str(alias), str(tmp_path / "missing")])
+    assert refreshed[-1] == (tmp_path / "missing").resolve()
+
+
+def test_main_scans_repo_end_to_end(monkeypatch, capsys, tmp_path: Path) -> None:
+    repo = tmp_path.resolve() / "repo"
+    _write(repo / "pkg" / "__init__.py", "")
+    _write(repo / "pkg" / "mod.py", "import os, json\n")
+    _write(repo / "data" / "evo_ingest" / "processed" / "done.py", "import sys\n")
+    _write(repo / "run.log", "x")
+    corpus = _write(repo / "notes" / "corpus.txt", "evo\n" * 4096)
+    out_dir = tmp_path / "out"
+
+    monkeypatch.setattr(scanner, "detect_env_root", lru_cache(maxsize=1)(lambda: repo))
+    monkeypatch.setattr(scanner, "detect_shared_storage", lru_cache(maxsize=1)(lambda: None))
+    scanner.reset_root_caches()
+    try:
+        assert scanner.main(["--out", str(out_dir), "--window", "5", "--precise"]) == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert summary == {
+            "python_files": 2,
+            "unique_imports": 2,
+            "artifact_waves": 1,
+            "priority_texts": 1,
+        }
+
+        names = {path.name for path in out_dir.iterdir()}
+        assert names == {
+            "evo_dependency_map.json",
+            "evo_dependency_report.log",
+            scanner.ARTIFACTS_NDJSON_NAME,
+            scanner.IMPORT_CACHE_NAME,
+        }
+        written = json.loads((out_dir / "evo_dependency_map.json").read_text("utf-8"))
+        module = os.path.join("pkg", "mod.py")
+        assert written["forward_imports"] == {
+            os.path.join("pkg", "__init__.py"): [],
+            module: ["json", "os"],
+        }
+        assert written["artifacts_ndjson"] == str(out_dir / scanner.ARTIFACTS_NDJSON_NAME)
+        streamed = (out_dir / scanner.ARTIFACTS_NDJSON_NAME).read_text("utf-8").splitlines()
+        assert [json.loads(line)["path"] for line in streamed] == [str(repo / "run.log")]
+
+        parsed = []
+        original = scanner.parse_imports
+
+        def tracking_parse(path, precise=False):
+            parsed.append(path)
+            return original(path, precise)
+
+        monkeypatch.setattr(scanner, "parse_imports", tracking_parse)
+        payload = scanner.run_scan(out_dir=out_dir, precise=True)
+
+        assert parsed == []
+        assert payload["forward_imports"][module] == ["json", "os"]
+        # The staged copies under data/evo_ingest are never scanned again.
+        assert [entry["source"] for entry in payload["priority_texts"]] == [str(corpus)]
+    finally:
+        scanner.reset_root_caches()